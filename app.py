@@ -1,18 +1,51 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objs as go
 import random
-from datetime import datetime, timedelta, timezone
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime, timedelta, timezone
 import os
 
+# Plotly n'est importé que dans les fonctions de visualisation (import différé)
+# afin de ne pas ralentir le démarrage de chaque exécution du script
+
 # Nom du fichier CSV pour stocker les documents
 DOCUMENTS_CSV = 'sample_documents.csv'
 
+# Nombre maximal de graphiques conservés en cache (éviction LRU)
+CHART_CACHE_MAX_ENTRIES = 64
+
+# Détection des doublons : index des empreintes de contenu pour les fichiers présents sur disque
+CONTENT_HASH_INDEX_ENABLED = True
+# Taille des blocs lus lors du calcul des empreintes (lecture en flux)
+HASH_CHUNK_SIZE = 1024 * 1024
+# Nombre maximal d'empreintes conservées en cache
+CONTENT_HASH_CACHE_MAX_ENTRIES = 100000
+
+# Suivi des fichiers physiques : racines analysées, état du dernier scan et
+# référence de chaque document (mtime, taille, inode) à son ajout ou à sa validation
+SCAN_ROOTS = ['/documents']
+SCAN_STATE_CSV = 'file_scan_state.csv'
+FILE_REFERENCES_CSV = 'file_references.csv'
+SCAN_MAX_WORKERS = 8
+
+# Historique des modifications : journal des deltas et snapshots complets périodiques
+HISTORY_LOG = 'document_history.jsonl'
+HISTORY_SNAPSHOT_DIR = 'document_snapshots'
+HISTORY_SNAPSHOT_INDEX = os.path.join(HISTORY_SNAPSHOT_DIR, 'index.csv')
+# Nombre maximal de deltas rejoués depuis un snapshot
+HISTORY_SNAPSHOT_INTERVAL = 50
+
 @st.cache_data
-def load_documents():
+def load_documents(data_version=None):
     """
     Charge les documents depuis le CSV, crée un fichier vide s'il n'existe pas
+    
+    Args:
+        data_version (tuple): Version du CSV (voir get_data_version), clé du cache :
+            une modification externe du fichier provoque un nouveau chargement
     """
     # Colonnes requises pour l'application
     required_columns = ['filename', 'filepath', 'upload_date', 'category', 'tags', 'description', 'status']
@@ -51,19 +84,35 @@ def load_documents():
                 df['tags'] = df['tags'].apply(lambda x: '' if x == '0.0' or x == 'nan' or x == 'NaN' else x)
                 
             # Générer des tags si la colonne tags est vide
+            documents_before = df.copy()
+            backfilled = {}
             for idx, row in df.iterrows():
                 if pd.isna(row['tags']) or row['tags'] == '':
                     if not pd.isna(row['category']) and not pd.isna(row['description']):
                         df.at[idx, 'tags'] = generate_tags(row['category'], row['description'])
+                        backfilled.setdefault(idx, []).append('tags')
             
             # Générer des statuts si la colonne status est vide
             for idx, row in df.iterrows():
                 if pd.isna(row['status']) or row['status'] == '':
                     if not pd.isna(row['category']):
                         df.at[idx, 'status'] = assign_category_status(row['category'])
+                        backfilled.setdefault(idx, []).append('status')
             
-            # Sauvegarder les modifications (tags et statuts générés)
-            df.to_csv(DOCUMENTS_CSV, index=False)
+            # Sauvegarder les modifications (tags et statuts générés) uniquement si nécessaire
+            if backfilled:
+                previous_version = get_data_version()
+                df.to_csv(DOCUMENTS_CSV, index=False)
+                _advance_duplicate_index_version(previous_version)
+                # Les valeurs générées sont enregistrées dans l'historique en un seul delta
+                record_history(documents_before, 'bulk_update', updates=[
+                    {
+                        'index': _to_json_value(idx),
+                        'changes': {column: _to_json_value(df.at[idx, column]) for column in columns},
+                        'previous': {column: _to_json_value(documents_before.at[idx, column]) for column in columns}
+                    }
+                    for idx, columns in backfilled.items()
+                ])
             
             return df
         else:
@@ -80,6 +129,33 @@ def load_documents():
         # Retourner un DataFrame vide en cas d'erreur
         return pd.DataFrame(columns=required_columns)
 
+@st.cache_data
+def get_documents_index(data_version=None):
+    """
+    Indexe le corpus par catégorie et par statut pour les filtres de visualisation
+    
+    Args:
+        data_version (tuple): Version du CSV, clé du cache (voir load_documents)
+    
+    Returns:
+        dict: Listes triées des catégories et statuts, et positions des documents pour chacun
+    """
+    df = load_documents(data_version)
+    index = {'categories': [], 'statuses': [], 'by_category': {}, 'by_status': {}}
+    
+    if df.empty:
+        return index
+    
+    for column, values_key, groups_key in [('category', 'categories', 'by_category'),
+                                           ('status', 'statuses', 'by_status')]:
+        if column not in df.columns:
+            continue
+        groups = df.groupby(column, dropna=True).indices
+        index[groups_key] = {key: positions.tolist() for key, positions in groups.items()}
+        index[values_key] = sorted(index[groups_key].keys(), key=str)
+    
+    return index
+
 def generate_random_date(days_range=0):
     """
     Génère la date du jour plutôt qu'une date aléatoire
@@ -213,7 +289,7 @@ def get_documents_dataframe(search_category=None, search_tags=None):
     """
     Récupère les documents sous forme de DataFrame avec filtres optionnels
     """
-    df = load_documents()
+    df = load_documents(get_data_version())
     
     # Si le DataFrame est vide, retournez-le tel quel
     if df.empty:
@@ -232,6 +308,9 @@ def create_category_donut_chart(df):
     """
     Crée un graphique en donut pour les catégories avec gestion des filtres
     """
+    import plotly.express as px
+    import plotly.graph_objs as go
+    
     if df.empty:
         fig = go.Figure()
         fig.update_layout(title="Aucune donnée disponible pour les catégories")
@@ -275,6 +354,9 @@ def create_status_bar_chart(df):
     """
     Crée un graphique à barres pour les statuts avec gestion des filtres
     """
+    import plotly.express as px
+    import plotly.graph_objs as go
+    
     if df.empty or 'status' not in df.columns:
         fig = go.Figure()
         fig.update_layout(title="Aucune donnée disponible pour les statuts")
@@ -315,6 +397,9 @@ def create_tags_bar_chart(df):
     """
     Crée un graphique à barres pour les tags les plus fréquents avec gestion des filtres
     """
+    import plotly.express as px
+    import plotly.graph_objs as go
+    
     if df.empty or 'tags' not in df.columns:
         fig = go.Figure()
         fig.update_layout(title="Aucune donnée disponible pour les tags")
@@ -362,7 +447,815 @@ def create_tags_bar_chart(df):
     
     return fig
 
-def add_document(filename, filepath, category, tags, description, random_date=False):
+def get_data_version():
+    """
+    Retourne une version des données basée sur la date de modification et la taille du CSV
+    
+    Returns:
+        tuple: (mtime_ns, taille) du fichier, ou None s'il n'existe pas
+    """
+    try:
+        stat = os.stat(DOCUMENTS_CSV)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def filter_documents_for_viz(data_version, filter_category, filter_status, as_of=None):
+    """
+    Filtre les documents pour les visualisations à partir des positions indexées
+    
+    Args:
+        data_version (tuple): Version du CSV, transmise aux chargements mis en cache
+        filter_category (str): Catégorie sélectionnée ("Toutes" pour ne pas filtrer)
+        filter_status (str): Statut sélectionné ("Tous" pour ne pas filtrer)
+        as_of (date): Si renseignée, filtre le corpus tel qu'il était à cette date
+    """
+    if as_of is not None:
+        # Corpus historique : pas d'index précalculé, filtrage direct
+        documents_df = get_documents_as_of(as_of, data_version)
+        if filter_category != "Toutes":
+            documents_df = documents_df[documents_df['category'] == filter_category]
+        if filter_status != "Tous":
+            documents_df = documents_df[documents_df['status'] == filter_status]
+        return documents_df
+    
+    documents_df = load_documents(data_version)
+    documents_index = get_documents_index(data_version)
+    
+    positions = None
+    if filter_category != "Toutes":
+        positions = set(documents_index['by_category'].get(filter_category, []))
+    if filter_status != "Tous":
+        status_positions = set(documents_index['by_status'].get(filter_status, []))
+        positions = status_positions if positions is None else positions & status_positions
+    
+    if positions is None:
+        return documents_df
+    return documents_df.iloc[sorted(positions)]
+
+CHART_BUILDERS = {
+    'categories': create_category_donut_chart,
+    'status': create_status_bar_chart,
+    'tags': create_tags_bar_chart
+}
+
+@st.cache_resource(max_entries=CHART_CACHE_MAX_ENTRIES)
+def get_chart_figure(chart_kind, data_version, filter_category, filter_status, as_of=None):
+    """
+    Retourne la figure Plotly mémorisée pour un type de graphique et un état des filtres
+    
+    Le cache est partagé entre les sessions et borné (éviction LRU) : les
+    changements de widgets sans rapport (choix d'action, onglets) ne
+    réagrègent ni ne reconstruisent les graphiques. La sérialisation JSON
+    reste faite par st.plotly_chart à chaque affichage.
+    
+    Args:
+        chart_kind (str): Type de graphique ('categories', 'status' ou 'tags')
+        data_version (tuple): Version des données, invalide le cache quand le CSV change
+        filter_category (str): Catégorie sélectionnée
+        filter_status (str): Statut sélectionné
+        as_of (date): Date de consultation pour une vue historique (None pour l'état actuel)
+    """
+    filtered_df = filter_documents_for_viz(data_version, filter_category, filter_status, as_of)
+    return CHART_BUILDERS[chart_kind](filtered_df)
+
+def _to_json_value(value):
+    """
+    Convertit une valeur de cellule en valeur sérialisable en JSON
+    """
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        # Types numpy (int64, float64, ...)
+        return value.item()
+    return value
+
+def _parse_history_timestamp(value):
+    """
+    Convertit une date (date, datetime ou chaîne) en Timestamp UTC
+    
+    Une date seule (sans heure) désigne la fin de cette journée.
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    else:
+        timestamp = timestamp.tz_convert('UTC')
+    
+    date_only = (isinstance(value, date) and not isinstance(value, datetime)) or \
+        (isinstance(value, str) and len(value.strip()) == 10)
+    if date_only:
+        timestamp = timestamp + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    return timestamp
+
+def _row_to_json(row):
+    """
+    Convertit une ligne de documents en dictionnaire sérialisable en JSON
+    """
+    return {column: _to_json_value(value) for column, value in row.items()}
+
+def load_snapshot_index():
+    """
+    Charge l'index des snapshots complets de l'historique
+    
+    Returns:
+        DataFrame: Un snapshot par ligne (fichier, date, position dans le journal des deltas)
+    """
+    index_columns = ['snapshot_file', 'timestamp', 'log_offset']
+    if not os.path.exists(HISTORY_SNAPSHOT_INDEX):
+        return pd.DataFrame(columns=index_columns)
+    
+    snapshot_index = pd.read_csv(HISTORY_SNAPSHOT_INDEX)
+    snapshot_index['timestamp'] = pd.to_datetime(snapshot_index['timestamp'], utc=True)
+    return snapshot_index
+
+def _write_snapshot(documents_df, log_offset):
+    """
+    Enregistre un snapshot complet des documents et l'ajoute à l'index
+    """
+    os.makedirs(HISTORY_SNAPSHOT_DIR, exist_ok=True)
+    timestamp = datetime.now(timezone.utc)
+    snapshot_file = f"snapshot_{timestamp.strftime('%Y%m%dT%H%M%S%f')}.csv"
+    documents_df.to_csv(os.path.join(HISTORY_SNAPSHOT_DIR, snapshot_file), index=False)
+    
+    entry = pd.DataFrame({
+        'snapshot_file': [snapshot_file],
+        'timestamp': [timestamp.isoformat()],
+        'log_offset': [log_offset]
+    })
+    entry.to_csv(HISTORY_SNAPSHOT_INDEX, mode='a', index=False,
+                 header=not os.path.exists(HISTORY_SNAPSHOT_INDEX))
+
+def _read_deltas(log_offset):
+    """
+    Lit les deltas du journal à partir d'une position (en octets)
+    """
+    if not os.path.exists(HISTORY_LOG):
+        return
+    
+    with open(HISTORY_LOG, 'r', encoding='utf-8') as f:
+        f.seek(log_offset)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+@st.cache_resource
+def get_history_lock():
+    """
+    Verrou partagé entre les sessions et les threads pour l'écriture de l'historique
+    """
+    return threading.Lock()
+
+def record_history(documents_before, operation, **delta):
+    """
+    Enregistre une modification du corpus sous forme de delta compact
+    
+    Un snapshot complet de l'état précédent est pris au premier enregistrement
+    puis tous les HISTORY_SNAPSHOT_INTERVAL deltas, afin que la reconstruction
+    d'un état passé ne rejoue jamais plus de deltas que cet intervalle.
+    L'écriture (snapshot, index et delta) est protégée par un verrou commun
+    à tout le processus.
+    
+    Les tags et statuts générés par load_documents sont enregistrés
+    ('bulk_update') ; l'ajout de colonnes manquantes (vides) ne l'est pas.
+    
+    Args:
+        documents_before (DataFrame): Documents avant la modification
+        operation (str): 'add', 'update', 'bulk_update' ou 'delete'
+        **delta: Contenu du delta (row, index/changes/previous, updates, indices/rows)
+    """
+    try:
+        with get_history_lock():
+            _append_history(documents_before, operation, delta)
+    except Exception as e:
+        st.warning(f"Modification non enregistrée dans l'historique: {e}")
+
+def _append_history(documents_before, operation, delta):
+    """
+    Écrit un delta dans le journal, précédé d'un snapshot si nécessaire (appelé sous verrou)
+    """
+    log_offset = os.path.getsize(HISTORY_LOG) if os.path.exists(HISTORY_LOG) else 0
+    snapshot_index = load_snapshot_index()
+    
+    if snapshot_index.empty:
+        _write_snapshot(documents_before, log_offset)
+    else:
+        last_offset = int(snapshot_index['log_offset'].iloc[-1])
+        deltas_since_snapshot = sum(1 for _ in _read_deltas(last_offset))
+        if deltas_since_snapshot >= HISTORY_SNAPSHOT_INTERVAL:
+            _write_snapshot(documents_before, log_offset)
+    
+    record = {'op': operation, 'ts': datetime.now(timezone.utc).isoformat()}
+    record.update(delta)
+    with open(HISTORY_LOG, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=_to_json_value) + '\n')
+
+def _set_delta_value(documents_df, index, column, value):
+    """
+    Affecte une valeur rejouée depuis l'historique
+    
+    Une colonne entièrement vide dans un snapshot est relue en float64
+    (NaN) : elle est convertie en object avant d'y écrire du texte.
+    """
+    if column in documents_df.columns and documents_df[column].dtype != object:
+        documents_df[column] = documents_df[column].astype(object)
+    documents_df.at[index, column] = value
+
+def _apply_delta(documents_df, delta):
+    """
+    Rejoue un delta de l'historique sur un DataFrame de documents
+    """
+    operation = delta['op']
+    
+    if operation == 'add':
+        return pd.concat([documents_df, pd.DataFrame([delta['row']])], ignore_index=True)
+    
+    if operation == 'update':
+        if delta['index'] in documents_df.index:
+            for column, value in delta['changes'].items():
+                _set_delta_value(documents_df, delta['index'], column, value)
+        return documents_df
+    
+    if operation == 'bulk_update':
+        for update in delta['updates']:
+            if update['index'] in documents_df.index:
+                for column, value in update['changes'].items():
+                    _set_delta_value(documents_df, update['index'], column, value)
+        return documents_df
+    
+    if operation == 'delete':
+        valid_indices = [idx for idx in delta['indices'] if idx in documents_df.index]
+        return documents_df.drop(valid_indices).reset_index(drop=True)
+    
+    return documents_df
+
+@st.cache_data
+def load_history_snapshot(snapshot_file):
+    """
+    Charge un snapshot complet (les snapshots ne sont jamais modifiés)
+    """
+    return pd.read_csv(os.path.join(HISTORY_SNAPSHOT_DIR, snapshot_file))
+
+@st.cache_data
+def get_documents_as_of(as_of, data_version=None):
+    """
+    Reconstitue le corpus tel qu'il était à une date donnée
+    
+    L'état est reconstruit depuis le snapshot le plus proche précédant la
+    date, puis les deltas suivants sont rejoués jusqu'à cette date. Pour
+    une date antérieure au début de l'historique, le premier snapshot est
+    filtré sur la date d'ajout des documents.
+    
+    Args:
+        as_of (date | datetime | str): Date de consultation (une date seule inclut toute la journée)
+        data_version (tuple): Version des données, invalide le cache quand le CSV change
+    
+    Returns:
+        DataFrame: Documents à la date demandée
+    """
+    as_of = _parse_history_timestamp(as_of)
+    snapshot_index = load_snapshot_index()
+    
+    # Pas encore d'historique : le corpus actuel, limité aux documents déjà ajoutés
+    if snapshot_index.empty:
+        documents_df = load_documents(data_version).copy()
+        before_history = True
+    else:
+        previous_snapshots = snapshot_index[snapshot_index['timestamp'] <= as_of]
+        before_history = previous_snapshots.empty
+        snapshot = snapshot_index.iloc[0] if before_history else previous_snapshots.iloc[-1]
+        documents_df = load_history_snapshot(snapshot['snapshot_file']).copy()
+        
+        if not before_history:
+            for delta in _read_deltas(int(snapshot['log_offset'])):
+                if _parse_history_timestamp(delta['ts']) > as_of:
+                    break
+                documents_df = _apply_delta(documents_df, delta)
+    
+    if 'upload_date' in documents_df.columns:
+        documents_df['upload_date'] = pd.to_datetime(documents_df['upload_date'], errors='coerce')
+        if before_history:
+            upload_dates = pd.to_datetime(documents_df['upload_date'], errors='coerce', utc=True)
+            documents_df = documents_df[upload_dates.isna() | (upload_dates <= as_of)]
+    
+    return documents_df
+
+def normalize_filepath(filepath):
+    """
+    Normalise un chemin de fichier pour la détection des doublons
+    
+    Returns:
+        str: Chemin normalisé, ou chaîne vide si le chemin est absent
+    """
+    if filepath is None or pd.isna(filepath):
+        return ''
+    
+    filepath = str(filepath).strip()
+    if not filepath:
+        return ''
+    
+    return os.path.normcase(os.path.normpath(os.path.expanduser(filepath)))
+
+@st.cache_resource(max_entries=CONTENT_HASH_CACHE_MAX_ENTRIES)
+def compute_content_hash(filepath, mtime_ns, size):
+    """
+    Calcule l'empreinte SHA-256 d'un fichier en le lisant par blocs
+    
+    Mis en cache par (chemin, mtime, taille) : un fichier inchangé n'est jamais relu.
+    Le cache de ressources n'est pas vidé lors des mises à jour du CSV.
+    """
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def get_content_hash(filepath):
+    """
+    Retourne l'empreinte de contenu d'un fichier présent sur disque
+    
+    Les fichiers vides ne sont pas indexés : ils ont tous la même empreinte.
+    
+    Returns:
+        str: Empreinte SHA-256, ou None si le fichier n'existe pas, est vide ou est illisible
+    """
+    if not filepath or not os.path.isfile(filepath):
+        return None
+    
+    try:
+        stat = os.stat(filepath)
+        if stat.st_size == 0:
+            return None
+        return compute_content_hash(filepath, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+@st.cache_resource
+def get_duplicate_index():
+    """
+    Index d'unicité partagé entre les sessions : chemin normalisé et empreinte de contenu
+    
+    L'index est mis à jour en place par add_document et reconstruit
+    uniquement lorsque le CSV a été modifié par ailleurs (suppression,
+    modification externe).
+    
+    Returns:
+        dict: Positions des documents par chemin normalisé et par empreinte
+    """
+    return {'data_version': None, 'filepath': {}, 'content_hash': {}, 'lock': threading.Lock()}
+
+def _refresh_duplicate_index(index, documents_df):
+    """
+    Reconstruit l'index d'unicité si la version des données a changé
+    """
+    data_version = get_data_version()
+    if index['data_version'] == data_version and data_version is not None:
+        return
+    
+    index['filepath'] = {}
+    index['content_hash'] = {}
+    
+    if 'filepath' in documents_df.columns:
+        for position, filepath in enumerate(documents_df['filepath']):
+            normalized_path = normalize_filepath(filepath)
+            if not normalized_path:
+                continue
+            index['filepath'].setdefault(normalized_path, position)
+            
+            if CONTENT_HASH_INDEX_ENABLED:
+                content_hash = get_content_hash(normalized_path)
+                if content_hash:
+                    index['content_hash'].setdefault(content_hash, position)
+    
+    index['data_version'] = data_version
+
+def find_duplicate_document(documents_df, filepath):
+    """
+    Recherche en O(1) un document existant ayant le même chemin ou le même contenu
+    
+    Args:
+        documents_df (DataFrame): Documents existants
+        filepath (str): Chemin du document à ajouter
+    
+    Returns:
+        tuple: (position, raison) du document existant, ou (None, None) s'il n'y a pas de doublon
+    """
+    index = get_duplicate_index()
+    normalized_path = normalize_filepath(filepath)
+    
+    with index['lock']:
+        _refresh_duplicate_index(index, documents_df)
+        
+        if normalized_path in index['filepath']:
+            return index['filepath'][normalized_path], 'chemin identique'
+        
+        if CONTENT_HASH_INDEX_ENABLED:
+            content_hash = get_content_hash(normalized_path)
+            if content_hash and content_hash in index['content_hash']:
+                return index['content_hash'][content_hash], 'contenu identique'
+    
+    return None, None
+
+def _register_in_duplicate_index(filepath, position):
+    """
+    Ajoute un document à l'index d'unicité après sa sauvegarde
+    """
+    index = get_duplicate_index()
+    normalized_path = normalize_filepath(filepath)
+    
+    with index['lock']:
+        if normalized_path:
+            index['filepath'].setdefault(normalized_path, position)
+            if CONTENT_HASH_INDEX_ENABLED:
+                content_hash = get_content_hash(normalized_path)
+                if content_hash:
+                    index['content_hash'].setdefault(content_hash, position)
+        index['data_version'] = get_data_version()
+
+def _advance_duplicate_index_version(previous_version):
+    """
+    Reporte l'index d'unicité sur la nouvelle version du CSV après une
+    modification qui ne touche ni les chemins ni l'ordre des documents
+    
+    L'index n'est avancé que s'il était à jour avant la modification : un
+    index déjà périmé (suppression, modification externe) sera reconstruit.
+    """
+    index = get_duplicate_index()
+    with index['lock']:
+        if index['data_version'] == previous_version and previous_version is not None:
+            index['data_version'] = get_data_version()
+
+def merge_document(documents_df, position, filename, category, tags, description):
+    """
+    Fusionne un document en double dans le document existant et sauvegarde le CSV
+    
+    Les champs vides du document existant sont complétés et les tags sont réunis.
+    """
+    row_index = documents_df.index[position]
+    documents_before = documents_df.copy()
+    
+    for column, value in [('filename', filename), ('category', category), ('description', description)]:
+        current_value = documents_df.at[row_index, column]
+        if value and (pd.isna(current_value) or current_value == ''):
+            documents_df.at[row_index, column] = value
+    
+    if tags:
+        current_tags = documents_df.at[row_index, 'tags']
+        current_tags = [] if pd.isna(current_tags) or current_tags == '' else str(current_tags).split(',')
+        new_tags = [tag.strip() for tag in str(tags).split(',') if tag.strip()]
+        merged_tags = list(dict.fromkeys([tag.strip() for tag in current_tags] + new_tags))
+        documents_df.at[row_index, 'tags'] = ','.join(merged_tags)
+    
+    try:
+        documents_df.to_csv(DOCUMENTS_CSV, index=False)
+        st.session_state['documents_updated'] = True
+        # Les chemins ne changent pas : l'index reste valide pour la nouvelle version du CSV
+        _register_in_duplicate_index(documents_df['filepath'].iloc[position], position)
+        changed_columns = [column for column in ['filename', 'category', 'description', 'tags']
+                           if _to_json_value(documents_before.at[row_index, column])
+                           != _to_json_value(documents_df.at[row_index, column])]
+        record_history(
+            documents_before, 'update', index=_to_json_value(row_index),
+            changes={column: _to_json_value(documents_df.at[row_index, column]) for column in changed_columns},
+            previous={column: _to_json_value(documents_before.at[row_index, column]) for column in changed_columns}
+        )
+    except Exception as e:
+        st.error(f"Erreur lors de la sauvegarde des documents: {e}")
+    
+    return documents_df
+
+def find_duplicate_documents(use_content_hash=CONTENT_HASH_INDEX_ENABLED):
+    """
+    Rapport des doublons présents dans le corpus existant
+    
+    Args:
+        use_content_hash (bool): Si True, regroupe aussi les fichiers présents sur disque par contenu
+    
+    Returns:
+        DataFrame: Un groupe de doublons par ligne (type, clé, indices et noms des documents)
+    """
+    report_columns = ['duplicate_type', 'key', 'indices', 'filenames']
+    documents_df = load_documents(get_data_version())
+    
+    if documents_df.empty or 'filepath' not in documents_df.columns:
+        return pd.DataFrame(columns=report_columns)
+    
+    normalized_paths = documents_df['filepath'].apply(normalize_filepath)
+    keys = [('chemin', normalized_paths)]
+    if use_content_hash:
+        keys.append(('contenu', normalized_paths.apply(get_content_hash)))
+    
+    rows = []
+    for duplicate_type, key_series in keys:
+        key_series = key_series[key_series.notna() & (key_series != '')]
+        for key, group in key_series.groupby(key_series):
+            if len(group) < 2:
+                continue
+            rows.append({
+                'duplicate_type': duplicate_type,
+                'key': key,
+                'indices': group.index.tolist(),
+                'filenames': documents_df.loc[group.index, 'filename'].tolist()
+            })
+    
+    return pd.DataFrame(rows, columns=report_columns)
+
+def _scan_directory(directory):
+    """
+    Liste un répertoire avec os.scandir
+    
+    Returns:
+        tuple: (fichiers {chemin normalisé: (mtime_ns, taille, inode)}, sous-répertoires)
+    """
+    files = {}
+    subdirectories = []
+    
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files[normalize_filepath(entry.path)] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                except OSError:
+                    # Fichier supprimé ou inaccessible pendant le parcours
+                    continue
+    except OSError:
+        pass
+    
+    return files, subdirectories
+
+def scan_roots(roots, max_workers=SCAN_MAX_WORKERS):
+    """
+    Parcourt les racines en parallèle, un répertoire par tâche du pool de threads
+    
+    Returns:
+        dict: {chemin normalisé: (mtime_ns, taille, inode)} pour tous les fichiers trouvés
+    """
+    found_files = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, root) for root in roots if os.path.isdir(root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories = future.result()
+                found_files.update(files)
+                pending.update(executor.submit(_scan_directory, subdirectory) for subdirectory in subdirectories)
+    
+    return found_files
+
+def load_file_states(csv_file):
+    """
+    Charge des états de fichiers (état du scan ou références des documents) depuis un CSV
+    
+    Les lignes ajoutées plus tard remplacent les précédentes pour un même chemin.
+    
+    Returns:
+        dict: {chemin normalisé: (mtime_ns, taille, inode)}
+    """
+    if not os.path.exists(csv_file) or os.path.getsize(csv_file) == 0:
+        return {}
+    
+    try:
+        state_df = pd.read_csv(csv_file, dtype={'filepath': str})
+    except Exception as e:
+        st.warning(f"Fichier {csv_file} illisible, il sera reconstruit: {e}")
+        return {}
+    
+    return {
+        filepath: (int(mtime_ns), int(size), int(inode))
+        for filepath, mtime_ns, size, inode in zip(
+            state_df['filepath'], state_df['mtime_ns'], state_df['size'], state_df['inode']
+        )
+    }
+
+def save_file_states(states, csv_file, append=False):
+    """
+    Sauvegarde des états de fichiers dans un CSV (en ajout si append vaut True)
+    """
+    state_df = pd.DataFrame(
+        [(filepath, mtime_ns, size, inode) for filepath, (mtime_ns, size, inode) in states.items()],
+        columns=['filepath', 'mtime_ns', 'size', 'inode']
+    )
+    write_header = not append or not os.path.exists(csv_file) or os.path.getsize(csv_file) == 0
+    state_df.to_csv(csv_file, mode='a' if append else 'w', index=False, header=write_header)
+
+def _stat_file(normalized_path):
+    """
+    Retourne (mtime_ns, taille, inode) d'un fichier, ou None s'il n'existe pas
+    """
+    if not normalized_path:
+        return None
+    try:
+        stat = os.stat(normalized_path)
+    except OSError:
+        return None
+    if not os.path.isfile(normalized_path):
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def record_file_reference(filepath):
+    """
+    Enregistre la référence (mtime, taille, inode) du fichier d'un document
+    
+    Appelé à l'ajout d'un document : les modifications ultérieures du
+    fichier sont détectées par rapport à cette référence.
+    """
+    normalized_path = normalize_filepath(filepath)
+    reference = _stat_file(normalized_path)
+    if reference is None:
+        return
+    
+    try:
+        save_file_states({normalized_path: reference}, FILE_REFERENCES_CSV, append=True)
+    except Exception as e:
+        st.warning(f"Référence du fichier non enregistrée: {e}")
+
+def _is_under_roots(normalized_path, normalized_roots):
+    """
+    Vérifie si un chemin normalisé se trouve sous l'une des racines
+    """
+    return any(normalized_path == root or normalized_path.startswith(root.rstrip(os.sep) + os.sep)
+               for root in normalized_roots)
+
+def reconcile_physical_files(roots=None, max_workers=SCAN_MAX_WORKERS):
+    """
+    Rapproche les documents enregistrés des fichiers présents sur disque
+    
+    Chaque document est comparé à sa propre référence (mtime, taille, inode),
+    enregistrée à son ajout ou à la validation d'un changement : les états
+    'Modifié' et 'Déplacé' restent signalés tant qu'ils n'ont pas été validés
+    avec acknowledge_file_changes. Un document sans référence reçoit celle
+    du fichier trouvé lors de ce scan.
+    
+    L'état du scan n'est remplacé que pour les racines analysées ; il sert
+    à retrouver les fichiers déplacés et à compter les fichiers ajoutés,
+    modifiés ou disparus depuis le scan précédent de ces racines.
+    
+    Args:
+        roots (list): Racines à analyser (SCAN_ROOTS par défaut)
+        max_workers (int): Nombre de threads du parcours
+    
+    Returns:
+        tuple: (DataFrame des documents avec leur état de fichier, dict de statistiques du scan)
+    """
+    report_columns = ['index', 'filename', 'filepath', 'file_status', 'new_filepath']
+    roots = SCAN_ROOTS if roots is None else roots
+    normalized_roots = [normalize_filepath(root) for root in roots if normalize_filepath(root)]
+    
+    previous_state = load_file_states(SCAN_STATE_CSV)
+    scanned_state = scan_roots(normalized_roots, max_workers)
+    
+    # Fusionner le scan dans l'état stocké, pour les racines analysées uniquement
+    previous_in_roots = {path for path in previous_state if _is_under_roots(path, normalized_roots)}
+    added = [path for path in scanned_state if path not in previous_state]
+    changed = {path for path in scanned_state
+               if path in previous_state and scanned_state[path] != previous_state[path]}
+    removed = [path for path in previous_in_roots if path not in scanned_state]
+    
+    current_state = {path: state for path, state in previous_state.items() if path not in previous_in_roots}
+    current_state.update(scanned_state)
+    
+    documents_df = load_documents(get_data_version())
+    document_paths = {}
+    if not documents_df.empty and 'filepath' in documents_df.columns:
+        document_paths = {
+            index: normalize_filepath(filepath) for index, filepath in documents_df['filepath'].items()
+        }
+    
+    # Fichiers non suivis par un document, par (inode, taille) : cibles possibles d'un déplacement
+    tracked_paths = set(document_paths.values())
+    untracked_by_inode = {}
+    for path, (mtime_ns, size, inode) in current_state.items():
+        if path not in tracked_paths:
+            untracked_by_inode[(inode, size)] = path
+    
+    references = load_file_states(FILE_REFERENCES_CSV)
+    new_references = {}
+    
+    rows = []
+    for index, normalized_path in document_paths.items():
+        new_filepath = ''
+        if _is_under_roots(normalized_path, normalized_roots):
+            current = scanned_state.get(normalized_path)
+        else:
+            # Les documents hors des racines analysées sont vérifiés individuellement
+            current = _stat_file(normalized_path)
+        reference = references.get(normalized_path)
+        
+        if not normalized_path:
+            file_status = 'Sans chemin'
+        elif current is not None:
+            if reference is None:
+                new_references[normalized_path] = current
+                file_status = 'Présent'
+            else:
+                file_status = 'Modifié' if current != reference else 'Présent'
+        elif reference is not None:
+            mtime_ns, size, inode = reference
+            new_filepath = untracked_by_inode.get((inode, size), '')
+            file_status = 'Déplacé' if new_filepath else 'Manquant'
+        else:
+            file_status = 'Manquant'
+        
+        rows.append({
+            'index': index,
+            'filename': documents_df.at[index, 'filename'],
+            'filepath': documents_df.at[index, 'filepath'],
+            'file_status': file_status,
+            'new_filepath': new_filepath
+        })
+    
+    # Sauvegarder l'état fusionné uniquement si quelque chose a changé
+    try:
+        if added or changed or removed:
+            save_file_states(current_state, SCAN_STATE_CSV)
+        if new_references:
+            save_file_states(new_references, FILE_REFERENCES_CSV, append=True)
+    except Exception as e:
+        st.error(f"Erreur lors de la sauvegarde de l'état du scan: {e}")
+    
+    summary = {
+        'scanned': len(scanned_state),
+        'added': len(added),
+        'changed': len(changed),
+        'removed': len(removed),
+        'new_references': len(new_references)
+    }
+    
+    return pd.DataFrame(rows, columns=report_columns), summary
+
+def acknowledge_file_changes(report_rows):
+    """
+    Valide les changements signalés par reconcile_physical_files
+    
+    Un fichier 'Modifié' reçoit une nouvelle référence ; un fichier
+    'Déplacé' met à jour le chemin du document (enregistré dans l'historique).
+    Les lignes dont le document ou le fichier a changé depuis le scan sont ignorées.
+    
+    Args:
+        report_rows (DataFrame): Lignes du rapport de scan à valider
+    
+    Returns:
+        int: Nombre de changements validés
+    """
+    documents_df = load_documents(get_data_version()).copy()
+    documents_before = documents_df.copy()
+    references = load_file_states(FILE_REFERENCES_CSV)
+    
+    acknowledged = 0
+    moves = []
+    for _, row in report_rows.iterrows():
+        document_index = row['index']
+        if document_index not in documents_df.index:
+            continue
+        normalized_path = normalize_filepath(documents_df.at[document_index, 'filepath'])
+        if normalized_path != normalize_filepath(row['filepath']):
+            continue
+        
+        if row['file_status'] == 'Modifié':
+            current = _stat_file(normalized_path)
+            if current is not None:
+                references[normalized_path] = current
+                acknowledged += 1
+        elif row['file_status'] == 'Déplacé':
+            new_path = normalize_filepath(row['new_filepath'])
+            current = _stat_file(new_path)
+            if current is not None:
+                documents_df.at[document_index, 'filepath'] = row['new_filepath']
+                references.pop(normalized_path, None)
+                references[new_path] = current
+                moves.append((document_index, row['filepath'], row['new_filepath']))
+                acknowledged += 1
+    
+    try:
+        if moves:
+            documents_df.to_csv(DOCUMENTS_CSV, index=False)
+            st.session_state['documents_updated'] = True
+            
+            # Un delta par déplacement, chacun avec l'état qui le précède
+            state = documents_before
+            for document_index, old_filepath, new_filepath in moves:
+                record_history(state, 'update', index=_to_json_value(document_index),
+                               changes={'filepath': new_filepath}, previous={'filepath': old_filepath})
+                state = state.copy()
+                state.at[document_index, 'filepath'] = new_filepath
+        
+        if acknowledged:
+            # Réécriture complète : compacte aussi les références remplacées
+            save_file_states(references, FILE_REFERENCES_CSV)
+    except Exception as e:
+        st.error(f"Erreur lors de la validation des changements: {e}")
+        return 0
+    
+    return acknowledged
+
+def add_document(filename, filepath, category, tags, description, random_date=False, on_duplicate='reject'):
     """
     Ajoute un nouveau document au CSV et retourne le DataFrame mis à jour
     
@@ -373,9 +1266,24 @@ def add_document(filename, filepath, category, tags, description, random_date=Fa
         tags (str): Tags du document (si vide, seront générés automatiquement)
         description (str): Description du document
         random_date (bool): Si True, génère une date aléatoire au lieu de la date actuelle
+        on_duplicate (str): 'reject' pour refuser un doublon, 'merge' pour le fusionner avec l'existant
+    
+    Returns:
+        tuple: (DataFrame, bool) - Documents mis à jour et True si le document a été fusionné avec un doublon
+    
+    Raises:
+        ValueError: Si le document est un doublon et que on_duplicate vaut 'reject'
     """
     # Charger les documents existants
-    documents_df = load_documents()
+    documents_df = load_documents(get_data_version())
+    
+    # Vérifier l'unicité du chemin (et du contenu pour les fichiers présents sur disque)
+    duplicate_position, duplicate_reason = find_duplicate_document(documents_df, filepath)
+    if duplicate_position is not None:
+        existing_filename = documents_df['filename'].iloc[duplicate_position]
+        if on_duplicate == 'merge':
+            return merge_document(documents_df.copy(), duplicate_position, filename, category, tags, description), True
+        raise ValueError(f"Document en double ({duplicate_reason}) avec '{existing_filename}'")
     
     # Toujours générer les tags automatiquement si l'utilisateur n'en a pas spécifié
     # Cela garantit que l'attribution automatique fonctionne comme prévu
@@ -410,26 +1318,38 @@ def add_document(filename, filepath, category, tags, description, random_date=Fa
     try:
         updated_documents.to_csv(DOCUMENTS_CSV, index=False)
         st.session_state['documents_updated'] = True
+        _register_in_duplicate_index(filepath, len(updated_documents) - 1)
+        record_file_reference(filepath)
+        record_history(documents_df, 'add', row=_row_to_json(updated_documents.iloc[-1]))
     except Exception as e:
         st.error(f"Erreur lors de la sauvegarde des documents: {e}")
     
-    return updated_documents
+    return updated_documents, False
 
 def update_document_status(document_index, new_status):
     """
     Met à jour le statut d'un document et sauvegarde les changements
     """
     # Charger les documents existants
-    documents_df = load_documents()
+    documents_df = load_documents(get_data_version())
     
     # Vérifier si l'index existe
     if document_index in documents_df.index:
-        # Mettre à jour le statut
+        # Mettre à jour le statut (en conservant l'état précédent pour l'historique)
+        documents_before = documents_df.copy()
         documents_df.loc[document_index, 'status'] = new_status
         
         # Sauvegarder les modifications
         try:
+            previous_version = get_data_version()
             documents_df.to_csv(DOCUMENTS_CSV, index=False)
+            # Les chemins ne changent pas : l'index d'unicité reste valide
+            _advance_duplicate_index_version(previous_version)
+            record_history(
+                documents_before, 'update', index=_to_json_value(document_index),
+                changes={'status': new_status},
+                previous={'status': _to_json_value(documents_before.at[document_index, 'status'])}
+            )
             # Signaler que les documents ont été mis à jour pour recharger le cache
             st.session_state['documents_updated'] = True
             return True
@@ -451,7 +1371,7 @@ def delete_document(document_index):
         bool: True si la suppression a réussi, False sinon
     """
     # Charger les documents existants
-    documents_df = load_documents()
+    documents_df = load_documents(get_data_version())
     
     try:
         # Vérifier que l'index existe
@@ -465,6 +1385,12 @@ def delete_document(document_index):
             # Sauvegarder le DataFrame mis à jour
             updated_df.to_csv(DOCUMENTS_CSV, index=False)
             
+            # Conserver la ligne supprimée dans l'historique
+            record_history(
+                documents_df, 'delete', indices=[_to_json_value(document_index)],
+                rows=[_row_to_json(documents_df.loc[document_index])]
+            )
+            
             # Signaler que les documents ont été mis à jour pour recharger le cache
             st.session_state['documents_updated'] = True
             
@@ -490,7 +1416,7 @@ def delete_multiple_documents(document_indices):
         return False, 0
         
     # Charger les documents existants
-    documents_df = load_documents()
+    documents_df = load_documents(get_data_version())
     
     try:
         # Vérifier que les indices existent
@@ -509,6 +1435,12 @@ def delete_multiple_documents(document_indices):
         # Sauvegarder le DataFrame mis à jour
         updated_df.to_csv(DOCUMENTS_CSV, index=False)
         
+        # Conserver les lignes supprimées dans l'historique
+        record_history(
+            documents_df, 'delete', indices=[_to_json_value(idx) for idx in valid_indices],
+            rows=[_row_to_json(documents_df.loc[idx]) for idx in valid_indices]
+        )
+        
         # Signaler que les documents ont été mis à jour pour recharger le cache
         st.session_state['documents_updated'] = True
         
@@ -573,6 +1505,15 @@ def main():
         else:
             st.info("Aucun document n'a encore été ajouté.")
 
+        # Vue historique : le corpus tel qu'il était à une date donnée
+        with st.expander("🕰️ Documents à une date passée"):
+            history_date = st.date_input("Date de consultation", value=date.today())
+            history_df = get_documents_as_of(history_date, get_data_version())
+            if not history_df.empty:
+                st.dataframe(history_df, use_container_width=True)
+            else:
+                st.info("Aucun document à cette date.")
+
     # Colonne d'Action
     with col_action:
         st.header("🚀 Action")
@@ -587,16 +1528,22 @@ def main():
                 description = st.text_area("Description")
                 random_date = st.checkbox("Utiliser une date aléatoire", value=True, 
                                          help="Si coché, la date actuelle sera utilisée comme date d'ajout.")
+                duplicate_action = st.radio("En cas de doublon", ["Rejeter", "Fusionner"], horizontal=True,
+                                            help="Un doublon a le même chemin ou, pour les fichiers présents sur disque, le même contenu.")
                 submit_button = st.form_submit_button(label='Ajouter')
 
                 if submit_button:
                     if filename and filepath:
                         try:
                             # Ajouter le document avec date aléatoire si demandé
-                            add_document(
-                                filename, filepath, category, tags, description, random_date
+                            _, merged = add_document(
+                                filename, filepath, category, tags, description, random_date,
+                                on_duplicate='merge' if duplicate_action == "Fusionner" else 'reject'
                             )
-                            st.success("Document ajouté avec succès!")
+                            if merged:
+                                st.success("Doublon détecté : document fusionné avec le document existant.")
+                            else:
+                                st.success("Document ajouté avec succès!")
                             st.experimental_rerun()  # Force le rechargement complet de l'application
                         except Exception as e:
                             st.error(f"Erreur lors de l'ajout du document : {e}")
@@ -622,6 +1569,52 @@ def main():
                     else:
                         st.warning("Aucun document trouvé.")
 
+        elif action == "Gérer les Documents":
+            st.subheader("Détection des doublons")
+            use_content_hash = st.checkbox("Comparer aussi le contenu des fichiers présents sur disque",
+                                           value=CONTENT_HASH_INDEX_ENABLED)
+            if st.button("Analyser les doublons"):
+                duplicates_df = find_duplicate_documents(use_content_hash)
+                if not duplicates_df.empty:
+                    st.dataframe(duplicates_df, use_container_width=True)
+                else:
+                    st.success("Aucun doublon détecté.")
+
+            st.subheader("Fichiers physiques")
+            scan_roots_input = st.text_input("Répertoires à analyser (séparés par des virgules)",
+                                             value=",".join(SCAN_ROOTS))
+            if st.button("Analyser les fichiers"):
+                roots = [root.strip() for root in scan_roots_input.split(",") if root.strip()]
+                st.session_state['scan_report'] = reconcile_physical_files(roots)
+            
+            # Le rapport est conservé en session pour pouvoir valider les changements
+            if 'scan_report' in st.session_state:
+                scan_report_df, scan_summary = st.session_state['scan_report']
+                st.write(f"{scan_summary['scanned']} fichiers analysés : "
+                         f"{scan_summary['added']} nouveaux, {scan_summary['changed']} modifiés, "
+                         f"{scan_summary['removed']} disparus depuis le dernier scan, "
+                         f"{scan_summary['new_references']} nouvelles références")
+                flagged_df = scan_report_df[scan_report_df['file_status'] != 'Présent']
+                if not flagged_df.empty:
+                    st.dataframe(flagged_df, use_container_width=True)
+                    
+                    pending_df = flagged_df[flagged_df['file_status'].isin(['Modifié', 'Déplacé'])]
+                    if not pending_df.empty:
+                        selected_indices = st.multiselect(
+                            "Changements à valider",
+                            pending_df['index'].tolist(),
+                            format_func=lambda idx: f"{pending_df.loc[pending_df['index'] == idx, 'filename'].iloc[0]} "
+                                                    f"({pending_df.loc[pending_df['index'] == idx, 'file_status'].iloc[0]})"
+                        )
+                        if st.button("Valider les changements sélectionnés") and selected_indices:
+                            acknowledged = acknowledge_file_changes(
+                                pending_df[pending_df['index'].isin(selected_indices)]
+                            )
+                            del st.session_state['scan_report']
+                            st.success(f"{acknowledged} changement(s) validé(s).")
+                else:
+                    st.success("Tous les fichiers des documents sont présents et inchangés.")
+
         # Le reste du code de la fonction main() reste similaire...
 
     # Colonne de Visualisation : Ajout des filtres
@@ -631,24 +1624,21 @@ def main():
         # Filtres pour les visualisations
         st.write("**Filtres de Visualisation**")
         
-        # Filtres par catégorie et statut
+        # Version des données : clé des données et des graphiques mis en cache
+        data_version = get_data_version()
+        
+        # Filtres par catégorie et statut (valeurs issues de l'index mis en cache)
+        documents_index = get_documents_index(data_version)
         filter_category_viz = st.selectbox(
             "Filtrer par Catégorie", 
-            ["Toutes"] + sorted(documents_df['category'].unique().tolist())
+            ["Toutes"] + documents_index['categories']
         )
         
         filter_status_viz = st.selectbox(
             "Filtrer par Statut", 
-            ["Tous"] + sorted(documents_df['status'].unique().tolist())
+            ["Tous"] + documents_index['statuses']
         )
         
-        # Appliquer les filtres au DataFrame
-        filtered_df = documents_df.copy()
-        if filter_category_viz != "Toutes":
-            filtered_df = filtered_df[filtered_df['category'] == filter_category_viz]
-        if filter_status_viz != "Tous":
-            filtered_df = filtered_df[filtered_df['status'] == filter_status_viz]
-        
         # Créer des onglets pour différentes visualisations
         tab1, tab2, tab3 = st.tabs([
             "Catégories", 
@@ -658,17 +1648,21 @@ def main():
 
         with tab1:
             # Graphique des catégories (Donut Chart)
-            fig_categories = create_category_donut_chart(filtered_df)
+            fig_categories = get_chart_figure('categories', data_version, filter_category_viz, filter_status_viz)
             st.plotly_chart(fig_categories, use_container_width=True)
 
         with tab2:
-            # Graphique des statuts
-            fig_status = create_status_bar_chart(filtered_df)
+            # Graphique des statuts, éventuellement à une date passée
+            status_as_of = None
+            if st.checkbox("Voir les statuts à une date passée"):
+                status_as_of = st.date_input("Statuts au", value=date.today())
+            fig_status = get_chart_figure('status', data_version, filter_category_viz, filter_status_viz,
+                                          status_as_of)
             st.plotly_chart(fig_status, use_container_width=True)
 
         with tab3:
             # Distribution des tags
-            fig_tags = create_tags_bar_chart(filtered_df)
+            fig_tags = get_chart_figure('tags', data_version, filter_category_viz, filter_status_viz)
             st.plotly_chart(fig_tags, use_container_width=True)
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+# Mesure le temps d'import des dépendances lourdes et le temps jusqu'au premier rendu de l'application
+APP_FILE = 'app.py'
+
+def run_in_fresh_process(code):
+    """
+    Exécute du code dans un interpréteur neuf (cache de modules et caches Streamlit vides)
+    et retourne les durées affichées, en secondes
+    """
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return [float(value) for value in result.stdout.split()]
+
+def measure_import(module_name):
+    """
+    Mesure le temps d'import d'un module dans un interpréteur neuf
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module_name}; "
+        "print(time.perf_counter() - start)"
+    )
+    return run_in_fresh_process(code)[0]
+
+def measure_app_import():
+    """
+    Mesure le temps d'import d'app.py (hors streamlit et pandas, déjà importés)
+    """
+    code = (
+        "import importlib.util, time; import streamlit, pandas; "
+        "start = time.perf_counter(); "
+        f"spec = importlib.util.spec_from_file_location('app', {APP_FILE!r}); "
+        "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module); "
+        "print(time.perf_counter() - start)"
+    )
+    return run_in_fresh_process(code)[0]
+
+def measure_renders():
+    """
+    Mesure le premier rendu d'un processus neuf, puis celui d'une seconde session
+    du même processus (qui réutilise les caches remplis par la première)
+    """
+    code = (
+        "import time; from streamlit.testing.v1 import AppTest\n"
+        "for _ in range(2):\n"
+        f"    app_test = AppTest.from_file({APP_FILE!r})\n"
+        "    start = time.perf_counter()\n"
+        "    app_test.run(timeout=60)\n"
+        "    print(time.perf_counter() - start)\n"
+    )
+    return run_in_fresh_process(code)
+
+print("Temps d'import (interpréteur neuf):")
+for module_name in ['streamlit', 'pandas', 'plotly.express', 'plotly.graph_objs']:
+    print(f"- {module_name}: {measure_import(module_name) * 1000:.1f} ms")
+print(f"- {APP_FILE}: {measure_app_import() * 1000:.1f} ms")
+
+first_render, second_session = measure_renders()
+
+print("\nTemps jusqu'au premier rendu:")
+print(f"- Premier rendu (processus neuf): {first_render * 1000:.1f} ms")
+print(f"- Seconde session (caches du processus réutilisés): {second_session * 1000:.1f} ms")
@@ -0,0 +1,70 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Vérifie que la vue historique "maintenant" reconstruit exactement le corpus actuel,
+# après une génération automatique des tags puis une modification de statut
+APP_FILE = os.path.abspath('app.py')
+CSV_FILE = os.path.abspath('sample_documents.csv')
+
+def load_app():
+    """
+    Charge app.py comme module (sans lancer l'interface Streamlit)
+    """
+    spec = importlib.util.spec_from_file_location('app', APP_FILE)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+def normalize(df):
+    """
+    Met un DataFrame sous une forme comparable (textes, valeurs vides uniformisées)
+    """
+    df = df.reset_index(drop=True).copy()
+    for column in df.columns:
+        df[column] = df[column].apply(lambda value: '' if pd.isna(value) else str(value))
+    return df
+
+def check_replay(app, step):
+    """
+    Compare la reconstruction à l'instant présent avec load_documents()
+    """
+    app.load_documents.clear()
+    app.get_documents_as_of.clear()
+    current_df = app.load_documents(app.get_data_version())
+    replayed_df = app.get_documents_as_of(datetime.now(timezone.utc), app.get_data_version())
+
+    columns = list(current_df.columns)
+    if list(replayed_df.columns) != columns or not normalize(replayed_df[columns]).equals(normalize(current_df)):
+        print(f"ÉCHEC ({step}): la reconstruction diffère du corpus actuel")
+        return False
+
+    print(f"OK ({step}): {len(replayed_df)} documents reconstruits à l'identique")
+    return True
+
+# Travailler sur une copie : le CSV et l'historique du dépôt ne sont pas modifiés
+work_dir = tempfile.mkdtemp()
+shutil.copy(CSV_FILE, work_dir)
+os.chdir(work_dir)
+
+try:
+    # Vider les tags comme csv-tags-cleaner.py pour déclencher leur génération
+    df = pd.read_csv(os.path.basename(CSV_FILE))
+    df['tags'] = ''
+    df.to_csv(os.path.basename(CSV_FILE), index=False)
+
+    app = load_app()
+    results = [check_replay(app, "génération des tags")]
+
+    app.update_document_status(0, 'Archivé')
+    results.append(check_replay(app, "modification de statut"))
+finally:
+    os.chdir(os.path.dirname(APP_FILE))
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+sys.exit(0 if all(results) else 1)